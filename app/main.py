@@ -1,8 +1,17 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, field_validator
 import httpx
+import diskcache
+import numpy as np
+import orjson
 import asyncio
+import functools
+import hashlib
 import logging
+import os
+import random
 from typing import List, Optional, Dict, Any
 import time
 
@@ -11,11 +20,28 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
+    default_response_class=ORJSONResponse,
     title="LLM Inference Service",
     description="A microservice for LLM inference using Ollama with Gemma2 model",
     version="1.0.0"
 )
 
+# Media type of token streams relayed from Ollama
+STREAM_MEDIA_TYPE = "application/x-ndjson"
+
+# Token streams declare an explicit Content-Encoding so GZipMiddleware
+# passes them through; a gzip stream buffers output and would hold back
+# streamed tokens
+STREAM_HEADERS = {"Content-Encoding": "identity"}
+
+# Compress responses of at least this many bytes
+GZIP_MINIMUM_SIZE = 1024
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
+# Gemma2 has an 8K token context; at roughly 4 characters per token,
+# longer prompts are rejected before they reach Ollama
+MAX_PROMPT_CHARS = 32000
+
 # Pydantic models
 class InferenceRequest(BaseModel):
     prompt: str
@@ -23,6 +49,16 @@ class InferenceRequest(BaseModel):
     temperature: Optional[float] = 0.7
     top_p: Optional[float] = 0.9
     stream: Optional[bool] = False
+    
+    @field_validator("prompt")
+    @classmethod
+    def check_prompt_length(cls, v: str) -> str:
+        if len(v) > MAX_PROMPT_CHARS:
+            raise ValueError(
+                f"prompt is {len(v)} characters and likely exceeds the model's 8K token context "
+                f"(limit {MAX_PROMPT_CHARS} characters)"
+            )
+        return v
 
 class InferenceResponse(BaseModel):
     response: str
@@ -47,55 +83,492 @@ class HealthResponse(BaseModel):
     message: str
     ollama_status: str
     available_models: List[str]
+    response_cache: Optional[Dict[str, int]] = None
 
 # Ollama client configuration
 OLLAMA_BASE_URL = "http://localhost:11434"
 MODEL_NAME = "gemma2:2b"
 
-async def check_ollama_health() -> bool:
+# Fixed part of every /api/generate payload; only the per-request fields
+# are filled in on the hot path
+_PAYLOAD_TEMPLATE = {
+    "model": MODEL_NAME,
+    "prompt": "",
+    "stream": False,
+    "options": None
+}
+
+# Headers for request bodies pre-encoded with orjson
+JSON_HEADERS = {"content-type": "application/json"}
+
+def build_generate_payload(request: InferenceRequest) -> Dict[str, Any]:
+    """Fill the generate payload template from an inference request"""
+    payload = _PAYLOAD_TEMPLATE.copy()
+    payload["prompt"] = request.prompt
+    payload["stream"] = request.stream
+    payload["options"] = {
+        "num_predict": request.max_tokens,
+        "temperature": request.temperature,
+        "top_p": request.top_p
+    }
+    return payload
+
+# Fallbacks for required InferenceResponse fields missing from Ollama's reply
+INFERENCE_RESPONSE_DEFAULTS = {
+    "response": "",
+    "model": MODEL_NAME,
+    "created_at": "",
+    "done": True
+}
+
+def to_inference_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the InferenceResponse fields out of an Ollama generate result"""
+    return {
+        field: result.get(field, INFERENCE_RESPONSE_DEFAULTS.get(field))
+        for field in InferenceResponse.model_fields
+    }
+
+# Shared HTTP client limits; a single pooled client keeps connections to
+# Ollama alive between requests instead of reconnecting on every call
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client used for all Ollama calls"""
+    return httpx.AsyncClient(
+        base_url=OLLAMA_BASE_URL,
+        limits=HTTP_LIMITS,
+        timeout=HTTP_TIMEOUT
+    )
+
+def get_http() -> httpx.AsyncClient:
+    """Dependency returning this process's shared Ollama client.
+    
+    Tests can swap it via app.dependency_overrides[get_http]; startup uses
+    the override too, so the swapped client serves every path.
+    """
+    return app.state.http
+
+# Maximum concurrent generate calls forwarded to Ollama by each worker
+# process; keep workers * MAX_CONCURRENCY within what Ollama can serve
+MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "16"))
+
+class AdmissionController:
+    """Limit how many generate calls are in flight against Ollama.
+    
+    Uses a counter guarded by an asyncio.Condition instead of a Semaphore
+    so the limit can be changed at runtime with set_limit().
+    """
+    
+    def __init__(self, limit: int = MAX_CONCURRENCY):
+        self.limit = limit
+        self.active = 0
+        self._cond = asyncio.Condition()
+    
+    async def acquire(self):
+        """Wait for a free slot and take it"""
+        async with self._cond:
+            while self.active >= self.limit:
+                await self._cond.wait()
+            self.active += 1
+    
+    async def release(self):
+        """Give a slot back and wake one waiter"""
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify(1)
+    
+    async def set_limit(self, limit: int):
+        """Change the concurrency limit and re-check all waiters"""
+        async with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.release()
+
+admission = AdmissionController()
+
+# Dynamic batching configuration
+MAX_BATCH_SIZE = 8
+# Seconds to wait for more requests before dispatching; 0 dispatches
+# whatever is already queued immediately
+MAX_BATCH_DELAY = float(os.getenv("MAX_BATCH_DELAY", "0"))
+
+class DynBatcher:
+    """Dispatch queued generate requests to Ollama in groups.
+    
+    A background task takes up to MAX_BATCH_SIZE queued requests at a time
+    and sends each one as its own POST, concurrently, on the pooled client.
+    Ollama has no multi-prompt endpoint, so nothing is combined upstream;
+    any batching on the model is done by Ollama's scheduler
+    (OLLAMA_NUM_PARALLEL). By default a lone request is dispatched without
+    waiting; a non-zero MAX_BATCH_DELAY holds the first request that long
+    to collect more.
+    """
+    
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE, max_delay: float = MAX_BATCH_DELAY):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+    
+    def start(self):
+        """Start the background collector task on the running loop"""
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the collector and wait for dispatched requests to finish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+    
+    async def submit(self, client: httpx.AsyncClient, payload: Dict[str, Any]) -> httpx.Response:
+        """Queue a generate payload and wait for Ollama's response"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((client, payload, future))
+        return await future
+    
+    async def _collect(self) -> List[tuple]:
+        """Wait for the first request, then take whatever else is queued"""
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        while len(batch) < self.max_batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+    
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            self.process_batched(batch)
+    
+    def process_batched(self, batch: List[tuple]):
+        """Dispatch each request in a batch as its own task.
+        
+        Each waiting future is resolved as soon as its own POST finishes, so
+        a short generation never waits for a longer one in the same batch.
+        """
+        for client, payload, future in batch:
+            task = asyncio.create_task(self._resolve(client, payload, future))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _resolve(self, client: httpx.AsyncClient, payload: Dict[str, Any], future: asyncio.Future):
+        """Send one payload and hand the outcome to its waiting caller"""
+        try:
+            result = await self._send(client, payload)
+        except Exception as e:
+            # The caller may have gone away (e.g. client disconnect)
+            if not future.done():
+                future.set_exception(e)
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            if not future.done():
+                future.set_result(result)
+    
+    async def _send(self, client: httpx.AsyncClient, payload: Dict[str, Any]) -> httpx.Response:
+        """POST one payload to Ollama once an admission slot is free"""
+        async with admission:
+            return await client.post(
+                "/api/generate",
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS,
+                timeout=60.0
+            )
+
+batcher = DynBatcher()
+
+# Requests at or below this temperature are treated as deterministic
+DETERMINISTIC_TEMPERATURE = 0.01
+
+# In-flight deterministic generations keyed by prompt hash and options
+_inflight_generations: Dict[str, asyncio.Task] = {}
+
+def is_deterministic(request: InferenceRequest) -> bool:
+    """Whether repeated runs of this request should produce the same output"""
+    return request.temperature is not None and request.temperature <= DETERMINISTIC_TEMPERATURE
+
+def generation_key(payload: Dict[str, Any]) -> str:
+    """Key identifying a generate payload by prompt hash and sampling options"""
+    digest = hashlib.blake2b(payload["prompt"].encode(), digest_size=16).hexdigest()
+    options = payload["options"]
+    return f"{digest}:{options['num_predict']}:{options['temperature']}:{options['top_p']}"
+
+async def submit_deduplicated(client: httpx.AsyncClient, payload: Dict[str, Any]) -> httpx.Response:
+    """Share one batched Ollama call between identical concurrent requests"""
+    key = generation_key(payload)
+    task = _inflight_generations.get(key)
+    if task is None:
+        # Own task so one caller disconnecting doesn't cancel it for the rest
+        task = asyncio.create_task(batcher.submit(client, payload))
+        _inflight_generations[key] = task
+        task.add_done_callback(lambda _: _inflight_generations.pop(key, None))
+    return await asyncio.shield(task)
+
+# Persistent LRU cache for deterministic responses
+RESPONSE_CACHE_DIR = "/var/cache/llm"
+RESPONSE_CACHE_SIZE_LIMIT = 512 * 1024 * 1024  # bytes
+
+# Timing fields reported as zero for responses served from the cache
+CACHED_DURATION_FIELDS = ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration")
+
+# Response cache hit/miss counters for this worker process; kept in memory
+# because diskcache's own stats turn every lookup into a write transaction
+_response_cache_counts = {"hits": 0, "misses": 0}
+
+def create_response_cache() -> Optional[diskcache.Cache]:
+    """Open the on-disk response cache, or return None if it is unavailable"""
+    try:
+        cache = diskcache.Cache(
+            RESPONSE_CACHE_DIR,
+            eviction_policy="least-recently-used",
+            size_limit=RESPONSE_CACHE_SIZE_LIMIT
+        )
+        return cache
+    except Exception as e:
+        logger.warning(f"Response cache disabled: {e}")
+        return None
+
+def response_cache_key(payload: Dict[str, Any]) -> str:
+    """Stable key for a generate payload"""
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+async def response_cache_stats() -> Optional[Dict[str, int]]:
+    """Hit/miss counters and entry count of the response cache"""
+    cache = app.state.response_cache
+    if cache is None:
+        return None
+    entries = await asyncio.to_thread(len, cache)
+    return {**_response_cache_counts, "entries": entries}
+
+# Semantic response cache: reuse a response for a sufficiently similar
+# prompt, judged by cosine similarity of Ollama embeddings
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+EMBEDDING_MODEL = "all-minilm"
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_MAX_ENTRIES = 1024
+SEMANTIC_CACHE_MAX_TEMPERATURE = 0.2
+
+class SemanticCache:
+    """Bounded in-memory store of (prompt embedding, response) pairs.
+    
+    Embeddings are kept L2-normalised in one matrix so a lookup is a single
+    matrix-vector product. Entries only match requests with the same
+    sampling options. When full, the oldest entry is overwritten.
+    """
+    
+    def __init__(self, max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES, threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.embeddings: Optional[np.ndarray] = None
+        self.option_keys: List[Optional[tuple]] = [None] * max_entries
+        self.responses: List[Optional[Dict[str, Any]]] = [None] * max_entries
+        self.size = 0
+        self._next = 0
+    
+    @staticmethod
+    def _normalise(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup(self, embedding: List[float], options_key: tuple) -> Optional[Dict[str, Any]]:
+        """Return the most similar cached response above the threshold"""
+        if self.size == 0:
+            return None
+        sims = self.embeddings[:self.size] @ self._normalise(embedding)
+        for i in np.argsort(sims)[::-1]:
+            if sims[i] < self.threshold:
+                break
+            if self.option_keys[i] == options_key:
+                return self.responses[i]
+        return None
+    
+    def add(self, embedding: List[float], options_key: tuple, response: Dict[str, Any]):
+        """Store a response, evicting the oldest entry when full"""
+        vector = self._normalise(embedding)
+        if self.embeddings is None:
+            self.embeddings = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+        i = self._next
+        self.embeddings[i] = vector
+        self.option_keys[i] = options_key
+        self.responses[i] = response
+        self._next = (i + 1) % self.max_entries
+        self.size = min(self.size + 1, self.max_entries)
+
+def is_semantic_cacheable(request: InferenceRequest) -> bool:
+    """Whether a request is low-temperature enough to answer from a similar prompt"""
+    return request.temperature is not None and request.temperature <= SEMANTIC_CACHE_MAX_TEMPERATURE
+
+async def embed_prompt(client: httpx.AsyncClient, prompt: str) -> Optional[List[float]]:
+    """Embed a prompt with Ollama, or return None if embedding fails"""
+    try:
+        response = await client.post(
+            "/api/embeddings",
+            content=orjson.dumps({"model": EMBEDDING_MODEL, "prompt": prompt}),
+            headers=JSON_HEADERS,
+            timeout=10.0
+        )
+        if response.status_code == 200:
+            return orjson.loads(response.content).get("embedding") or None
+        logger.warning(f"Embedding request failed: {response.status_code}")
+    except Exception as e:
+        logger.warning(f"Embedding request failed: {e}")
+    return None
+
+# Startup readiness backoff (seconds)
+STARTUP_RETRIES = 30
+STARTUP_BACKOFF_INITIAL = 0.1
+STARTUP_BACKOFF_MAX = 2.0
+STARTUP_BACKOFF_FACTOR = 1.7
+
+# Upstream probe cache TTLs (seconds)
+HEALTH_CACHE_TTL = 2.0
+MODELS_CACHE_TTL = 10.0
+
+def async_ttl_cache(ttl: float):
+    """Cache a coroutine's result for `ttl` seconds.
+    
+    Concurrent callers that miss the cache share a single in-flight call
+    (single-flight), so a burst of probes only reaches Ollama once. The
+    call runs as its own task, so cancelling one caller never cancels it
+    for the others. The check-and-set contains no await, so it is atomic
+    on the event loop. The undecorated coroutine stays available as
+    `__wrapped__`.
+    """
+    def decorator(func):
+        cache: Dict[tuple, tuple] = {}
+        
+        @functools.wraps(func)
+        async def wrapper(*args):
+            loop = asyncio.get_running_loop()
+            entry = cache.get(args)
+            # expiry is None while the call is still in flight
+            if entry is None or (entry[1] is not None and entry[1] <= loop.time()):
+                task = asyncio.create_task(func(*args))
+                entry = cache[args] = (task, None)
+                
+                def settle(task: asyncio.Task):
+                    if cache.get(args, (None,))[0] is not task:
+                        return
+                    if task.cancelled() or task.exception() is not None:
+                        cache.pop(args, None)
+                    else:
+                        cache[args] = (task, loop.time() + ttl)
+                
+                task.add_done_callback(settle)
+            return await asyncio.shield(entry[0])
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+@async_ttl_cache(HEALTH_CACHE_TTL)
+async def check_ollama_health(client: httpx.AsyncClient) -> bool:
     """Check if Ollama service is running"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{OLLAMA_BASE_URL}/api/version", timeout=5.0)
-            return response.status_code == 200
+        response = await client.get("/api/version", timeout=5.0)
+        return response.status_code == 200
     except Exception as e:
         logger.error(f"Ollama health check failed: {e}")
         return False
 
-async def get_available_models() -> List[str]:
+@async_ttl_cache(MODELS_CACHE_TTL)
+async def get_available_models(client: httpx.AsyncClient) -> List[str]:
     """Get list of available models from Ollama"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=10.0)
-            if response.status_code == 200:
-                data = response.json()
-                return [model["name"] for model in data.get("models", [])]
-            return []
+        response = await client.get("/api/tags", timeout=10.0)
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            return [model["name"] for model in data.get("models", [])]
+        return []
     except Exception as e:
         logger.error(f"Failed to get models: {e}")
         return []
 
-async def ensure_model_loaded() -> bool:
+async def ensure_model_loaded(client: httpx.AsyncClient) -> bool:
     """Ensure the Gemma2 model is loaded and ready"""
     try:
-        async with httpx.AsyncClient() as client:
-            # Try a simple generation to warm up the model
-            payload = {
-                "model": MODEL_NAME,
-                "prompt": "Hello",
-                "stream": False,
-                "options": {"num_predict": 1}
-            }
-            response = await client.post(
-                f"{OLLAMA_BASE_URL}/api/generate",
-                json=payload,
-                timeout=30.0
-            )
-            return response.status_code == 200
+        # Try a simple generation to warm up the model
+        payload = {
+            "model": MODEL_NAME,
+            "prompt": "Hello",
+            "stream": False,
+            "options": {"num_predict": 1}
+        }
+        response = await client.post(
+            "/api/generate",
+            json=payload,
+            timeout=30.0
+        )
+        return response.status_code == 200
     except Exception as e:
         logger.error(f"Model loading check failed: {e}")
         return False
 
+async def stream_inference(client: httpx.AsyncClient, payload: Dict[str, Any]) -> StreamingResponse:
+    """Forward Ollama's NDJSON token stream to the caller as it is generated"""
+    # The admission slot is held until the stream has been fully relayed
+    await admission.acquire()
+    try:
+        upstream = await client.send(
+            client.build_request(
+                "POST",
+                "/api/generate",
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS,
+                timeout=60.0
+            ),
+            stream=True
+        )
+    except BaseException:
+        await admission.release()
+        raise
+    
+    if upstream.status_code != 200:
+        await upstream.aread()
+        await upstream.aclose()
+        await admission.release()
+        logger.error(f"Ollama request failed: {upstream.status_code} - {upstream.text}")
+        raise HTTPException(
+            status_code=upstream.status_code,
+            detail=f"Ollama request failed: {upstream.text}"
+        )
+    
+    async def relay():
+        # Keep the upstream connection open until Ollama sends done:true
+        try:
+            async for chunk in upstream.aiter_bytes():
+                yield chunk
+        finally:
+            await upstream.aclose()
+            await admission.release()
+    
+    return StreamingResponse(relay(), media_type=STREAM_MEDIA_TYPE, headers=STREAM_HEADERS)
+
 @app.get("/", response_model=Dict[str, str])
 async def root():
     """Root endpoint"""
@@ -107,10 +580,14 @@ async def root():
     }
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(client: httpx.AsyncClient = Depends(get_http)):
     """Health check endpoint"""
-    ollama_healthy = await check_ollama_health()
-    available_models = await get_available_models()
+    # Probe both upstream endpoints concurrently; both already turn upstream
+    # failures into False / [] themselves
+    ollama_healthy, available_models = await asyncio.gather(
+        check_ollama_health(client),
+        get_available_models(client)
+    )
     
     if ollama_healthy and MODEL_NAME in available_models:
         status = "healthy"
@@ -129,69 +606,85 @@ async def health_check():
         status=status,
         message=message,
         ollama_status=ollama_status,
-        available_models=available_models
+        available_models=available_models,
+        response_cache=await response_cache_stats()
     )
 
 @app.post("/inference", response_model=InferenceResponse)
-async def generate_inference(request: InferenceRequest):
+async def generate_inference(request: InferenceRequest, client: httpx.AsyncClient = Depends(get_http)):
     """Generate inference using the Gemma2 model"""
     
-    # Check if Ollama is healthy
-    if not await check_ollama_health():
-        raise HTTPException(
-            status_code=503,
-            detail="Ollama service is not available"
-        )
-    
+    # No health probe here: an unreachable Ollama surfaces as a connection
+    # error from the request itself and is mapped to 503 below
     try:
         # Prepare the request payload for Ollama
-        payload = {
-            "model": MODEL_NAME,
-            "prompt": request.prompt,
-            "stream": request.stream,
-            "options": {
-                "num_predict": request.max_tokens,
-                "temperature": request.temperature,
-                "top_p": request.top_p
-            }
-        }
+        payload = build_generate_payload(request)
         
-        # Make request to Ollama
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{OLLAMA_BASE_URL}/api/generate",
-                json=payload,
-                timeout=60.0
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Ollama request failed: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Ollama request failed: {response.text}"
-                )
-            
-            result = response.json()
-            
-            return InferenceResponse(
-                response=result.get("response", ""),
-                model=result.get("model", MODEL_NAME),
-                created_at=result.get("created_at", ""),
-                done=result.get("done", True),
-                total_duration=result.get("total_duration"),
-                load_duration=result.get("load_duration"),
-                prompt_eval_count=result.get("prompt_eval_count"),
-                prompt_eval_duration=result.get("prompt_eval_duration"),
-                eval_count=result.get("eval_count"),
-                eval_duration=result.get("eval_duration")
+        if request.stream:
+            return await stream_inference(client, payload)
+        
+        # Serve deterministic prompts from the persistent cache when possible.
+        # diskcache is blocking SQLite shared across workers, so it runs in a
+        # thread to keep lock waits off the event loop
+        cache = app.state.response_cache if is_deterministic(request) else None
+        if cache is not None:
+            cache_key = response_cache_key(payload)
+            cached = await asyncio.to_thread(cache.get, cache_key)
+            if cached is not None:
+                _response_cache_counts["hits"] += 1
+                return ORJSONResponse({**cached, **dict.fromkeys(CACHED_DURATION_FIELDS, 0)})
+            _response_cache_counts["misses"] += 1
+        
+        # Then look for a response to a sufficiently similar prompt
+        semantic_cache = app.state.semantic_cache if is_semantic_cacheable(request) else None
+        embedding = None
+        if semantic_cache is not None:
+            options_key = tuple(payload["options"].values())
+            embedding = await embed_prompt(client, request.prompt)
+            if embedding is not None:
+                cached = semantic_cache.lookup(embedding, options_key)
+                if cached is not None:
+                    return ORJSONResponse({**cached, **dict.fromkeys(CACHED_DURATION_FIELDS, 0)})
+        
+        # Make request to Ollama through the dynamic batcher, sharing the
+        # call between identical deterministic requests already in flight
+        if is_deterministic(request):
+            response = await submit_deduplicated(client, payload)
+        else:
+            response = await batcher.submit(client, payload)
+        
+        if response.status_code != 200:
+            logger.error(f"Ollama request failed: {response.status_code} - {response.text}")
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Ollama request failed: {response.text}"
             )
-            
+        
+        result = orjson.loads(response.content)
+        
+        # Ollama's payload is trusted, so forward the InferenceResponse fields
+        # as-is and skip model construction plus response_model re-validation
+        content = to_inference_response(result)
+        if cache is not None:
+            await asyncio.to_thread(cache.set, cache_key, content)
+        if embedding is not None:
+            semantic_cache.add(embedding, options_key, content)
+        return ORJSONResponse(content)
+        
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         logger.error("Request to Ollama timed out")
         raise HTTPException(
             status_code=504,
             detail="Request timed out. The model might be loading or the prompt is too complex."
         )
+    except (httpx.ConnectError, httpx.ReadError, httpx.RemoteProtocolError) as e:
+        logger.error(f"Ollama is unreachable: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Ollama service is not available"
+        )
     except Exception as e:
         logger.error(f"Inference request failed: {e}")
         raise HTTPException(
@@ -200,41 +693,49 @@ async def generate_inference(request: InferenceRequest):
         )
 
 @app.get("/models", response_model=List[str])
-async def list_models():
+async def list_models(client: httpx.AsyncClient = Depends(get_http)):
     """List available models"""
-    models = await get_available_models()
+    models = await get_available_models(client)
     return models
 
 @app.get("/model/{model_name}", response_model=ModelInfo)
-async def get_model_info(model_name: str):
+async def get_model_info(model_name: str, client: httpx.AsyncClient = Depends(get_http)):
     """Get information about a specific model"""
+    # Unknown names are rejected from the cached model list without an
+    # upstream call; an empty list means it couldn't be fetched, so ask Ollama
+    models = await get_available_models(client)
+    if models and model_name not in models and f"{model_name}:latest" not in models:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Model '{model_name}' not found"
+        )
+    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{OLLAMA_BASE_URL}/api/show",
-                json={"name": model_name},
-                timeout=10.0
+        response = await client.post(
+            "/api/show",
+            json={"name": model_name},
+            timeout=10.0
+        )
+        
+        if response.status_code == 404:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Model '{model_name}' not found"
             )
-            
-            if response.status_code == 404:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Model '{model_name}' not found"
-                )
-            elif response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Failed to get model information"
-                )
-            
-            data = response.json()
-            return ModelInfo(
-                name=data.get("details", {}).get("name", model_name),
-                size=data.get("size", 0),
-                digest=data.get("digest", ""),
-                details=data.get("details", {})
+        elif response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail="Failed to get model information"
             )
-            
+        
+        data = orjson.loads(response.content)
+        return ModelInfo(
+            name=data.get("details", {}).get("name", model_name),
+            size=data.get("size", 0),
+            digest=data.get("digest", ""),
+            details=data.get("details", {})
+        )
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -249,32 +750,64 @@ async def startup_event():
     """Startup event to ensure model is ready"""
     logger.info("Starting LLM Inference Service...")
     
-    # Wait for Ollama to be ready
-    max_retries = 30
+    # Create the shared HTTP client for this process, or take the one
+    # supplied through a get_http dependency override
+    override = app.dependency_overrides.get(get_http)
+    app.state.owns_http = override is None
+    app.state.http = create_http_client() if override is None else override()
+    client = app.state.http
+    app.state.response_cache = create_response_cache()
+    app.state.semantic_cache = None
+    batcher.start()
+    
+    # Wait for Ollama to be ready, backing off exponentially with jitter
+    max_retries = STARTUP_RETRIES
+    delay = STARTUP_BACKOFF_INITIAL
     for i in range(max_retries):
-        if await check_ollama_health():
+        # Bypass the cache so a cached failure doesn't delay readiness
+        if await check_ollama_health.__wrapped__(client):
             logger.info("Ollama service is ready")
             break
         logger.info(f"Waiting for Ollama service... ({i+1}/{max_retries})")
-        await asyncio.sleep(2)
+        await asyncio.sleep(delay + random.uniform(0, delay * 0.1))
+        delay = min(delay * STARTUP_BACKOFF_FACTOR, STARTUP_BACKOFF_MAX)
     else:
         logger.error("Ollama service did not become ready in time")
         return
     
     # Check if model is available
-    models = await get_available_models()
+    models = await get_available_models(client)
+    
+    if SEMANTIC_CACHE_ENABLED:
+        if EMBEDDING_MODEL in models or f"{EMBEDDING_MODEL}:latest" in models:
+            app.state.semantic_cache = SemanticCache()
+            logger.info(f"Semantic cache enabled using {EMBEDDING_MODEL}")
+        else:
+            logger.warning(f"Semantic cache disabled: embedding model {EMBEDDING_MODEL} is not available")
     if MODEL_NAME in models:
         logger.info(f"Model {MODEL_NAME} is available")
         
         # Warm up the model
         logger.info("Warming up the model...")
-        if await ensure_model_loaded():
+        if await ensure_model_loaded(client):
             logger.info("Model is warmed up and ready")
+            # Drop probe results cached while the service was starting
+            check_ollama_health.cache_clear()
+            get_available_models.cache_clear()
         else:
             logger.warning("Model warm-up failed, but service will continue")
     else:
         logger.warning(f"Model {MODEL_NAME} is not available. Available models: {models}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Shutdown event to release pooled connections"""
+    await batcher.stop()
+    if app.state.owns_http:
+        await app.state.http.aclose()
+    if app.state.response_cache is not None:
+        app.state.response_cache.close()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
\ No newline at end of file
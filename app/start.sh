@@ -24,6 +24,23 @@ else
     echo "Gemma2:2b model already available"
 fi
 
-# Start the FastAPI service
-echo "Starting FastAPI service..."
-python main.py
\ No newline at end of file
+# Pull the embedding model used by the semantic cache when it is enabled
+case "${SEMANTIC_CACHE_ENABLED,,}" in
+    1|true|yes)
+        if ! ollama list | grep -q "all-minilm"; then
+            echo "Pulling all-minilm embedding model for the semantic cache..."
+            ollama pull all-minilm
+        fi
+        ;;
+esac
+
+# Start the FastAPI service with one Uvicorn worker per CPU by default.
+# Workers only heartbeat once startup has finished, so the worker timeout
+# must cover the Ollama readiness loop (~50s) plus model warm-up (up to
+# 30s); the graceful timeout lets in-flight 60s generate calls finish.
+WORKERS=${WEB_CONCURRENCY:-$(nproc)}
+WORKER_TIMEOUT=${WORKER_TIMEOUT:-120}
+GRACEFUL_TIMEOUT=${GRACEFUL_TIMEOUT:-90}
+echo "Starting FastAPI service with $WORKERS workers..."
+exec gunicorn main:app -k uvicorn.workers.UvicornWorker -w "$WORKERS" -b 0.0.0.0:8000 \
+    --timeout "$WORKER_TIMEOUT" --graceful-timeout "$GRACEFUL_TIMEOUT"
\ No newline at end of file
@@ -1,15 +1,56 @@
 # Example Integration: Python Client
 
-import requests
 import asyncio
-import aiohttp
-from typing import Optional, Dict, Any
+import httpx
+import orjson
+from typing import Optional, Dict, Any, List
 
 class MicroLLMService:
-    """Client for interacting with Micro LLM Service"""
+    """Client for interacting with Micro LLM Service
     
-    def __init__(self, base_url: str = "http://localhost:8100"):
+    Holds one pooled sync client, plus a pooled async client created on
+    first async use, so repeated calls reuse keep-alive connections instead
+    of reconnecting each time. An existing httpx.AsyncClient can be passed
+    in to share its pool; it is left open on close. Use it as a context
+    manager (sync or async) or call close()/aclose() when done.
+    """
+    
+    def __init__(self, base_url: str = "http://localhost:8100", async_client: Optional[httpx.AsyncClient] = None):
         self.base_url = base_url.rstrip('/')
+        self._limits = httpx.Limits(max_keepalive_connections=20)
+        self._sync = httpx.Client(base_url=self.base_url, timeout=120, limits=self._limits)
+        self._owns_async = async_client is None
+        self._async = async_client
+    
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """The pooled async client, created on first use"""
+        if self._async is None:
+            self._async = httpx.AsyncClient(base_url=self.base_url, timeout=120, limits=self._limits)
+        return self._async
+    
+    def close(self):
+        """Close the pooled sync client"""
+        self._sync.close()
+    
+    async def aclose(self):
+        """Close the pooled clients owned by this instance"""
+        self._sync.close()
+        if self._owns_async and self._async is not None:
+            await self._async.aclose()
+            self._async = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
     
     def generate_text(self, prompt: str, max_tokens: int = 512, temperature: float = 0.7) -> Dict[str, Any]:
         """
@@ -24,18 +65,17 @@ class MicroLLMService:
             Dict containing the response and metadata
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/inference",
+            response = self._sync.post(
+                "/inference",
                 json={
                     "prompt": prompt,
                     "max_tokens": max_tokens,
                     "temperature": temperature
-                },
-                timeout=120
+                }
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except httpx.HTTPError as e:
             return {"error": f"Request failed: {str(e)}"}
     
     def chat(self, message: str, max_tokens: int = 256, temperature: float = 0.8) -> Dict[str, Any]:
@@ -51,26 +91,25 @@ class MicroLLMService:
             Dict containing the response and metadata
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/chat",
+            response = self._sync.post(
+                "/inference",
                 json={
                     "prompt": message,
                     "max_tokens": max_tokens,
                     "temperature": temperature
-                },
-                timeout=120
+                }
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except httpx.HTTPError as e:
             return {"error": f"Chat request failed: {str(e)}"}
     
     def is_healthy(self) -> bool:
         """Check if the service is healthy"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=10)
+            response = self._sync.get("/health", timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 return data.get("status") == "healthy" and data.get("model_loaded", False)
             return False
         except:
@@ -79,22 +118,26 @@ class MicroLLMService:
     async def generate_text_async(self, prompt: str, max_tokens: int = 512, temperature: float = 0.7) -> Dict[str, Any]:
         """Async version of generate_text"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/inference",
-                    json={
-                        "prompt": prompt,
-                        "max_tokens": max_tokens,
-                        "temperature": temperature
-                    },
-                    timeout=aiohttp.ClientTimeout(total=120)
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        return {"error": f"HTTP {response.status}: {await response.text()}"}
+            response = await self.async_client.post(
+                f"{self.base_url}/inference",
+                json={
+                    "prompt": prompt,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature
+                }
+            )
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            else:
+                return {"error": f"HTTP {response.status_code}: {response.text}"}
         except Exception as e:
             return {"error": f"Async request failed: {str(e)}"}
+    
+    async def generate_many(self, prompts: List[str], max_tokens: int = 512, temperature: float = 0.7) -> List[Dict[str, Any]]:
+        """Generate text for several prompts concurrently, in prompt order"""
+        return await asyncio.gather(
+            *(self.generate_text_async(prompt, max_tokens, temperature) for prompt in prompts)
+        )
 
 # Example usage functions
 def example_basic_usage():
@@ -136,9 +179,15 @@ def example_chat_conversation():
         "How do I create a Dockerfile?"
     ]
     
-    for i, message in enumerate(messages, 1):
+    # The messages don't depend on each other, so send them concurrently
+    async def ask_all():
+        async with llm:
+            return await llm.generate_many(messages, max_tokens=150, temperature=0.8)
+    
+    results = asyncio.run(ask_all())
+    
+    for i, (message, result) in enumerate(zip(messages, results), 1):
         print(f"\n{i}. User: {message}")
-        result = llm.chat(message, max_tokens=150)
         
         if "error" in result:
             print(f"❌ Error: {result['error']}")
@@ -150,17 +199,15 @@ async def example_async_usage():
     print("\n⚡ Async Usage Example")
     print("=" * 40)
     
-    llm = MicroLLMService()
-    
-    # Generate multiple responses concurrently
+    # Generate multiple responses concurrently over one pooled client
     prompts = [
         "What is Python?",
         "Explain REST APIs",
         "What is Docker?"
     ]
     
-    tasks = [llm.generate_text_async(prompt, max_tokens=100) for prompt in prompts]
-    results = await asyncio.gather(*tasks)
+    async with MicroLLMService() as llm:
+        results = await llm.generate_many(prompts, max_tokens=100)
     
     for prompt, result in zip(prompts, results):
         print(f"\n📝 Prompt: {prompt}")
@@ -238,7 +285,7 @@ if __name__ == "__main__":
     print("🎉 All examples completed!")
     print("\n💡 Tips for production use:")
     print("- Add proper error handling and retries")
-    print("- Implement connection pooling for high throughput")
+    print("- Reuse one client instance so connections stay pooled")
     print("- Add authentication and rate limiting")
     print("- Monitor response times and model performance")
     print("- Consider using async clients for better performance")
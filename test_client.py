@@ -1,18 +1,30 @@
 # Micro LLM Test Client
 
-import requests
+import asyncio
+import httpx
+import orjson
 import json
 import time
 
 class MicroLLMClient:
     def __init__(self, base_url="http://localhost:8100"):
         self.base_url = base_url
+        # One pooled client so every test call reuses the same connection
+        self.client = httpx.Client(
+            base_url=base_url,
+            timeout=120,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+    
+    def close(self):
+        """Close the pooled HTTP client"""
+        self.client.close()
     
     def health_check(self):
         """Check if the service is healthy"""
         try:
-            response = requests.get(f"{self.base_url}/health")
-            return response.json()
+            response = self.client.get("/health")
+            return orjson.loads(response.content)
         except Exception as e:
             return {"error": str(e)}
     
@@ -24,8 +36,8 @@ class MicroLLMClient:
                 "max_tokens": max_tokens,
                 "temperature": temperature
             }
-            response = requests.post(f"{self.base_url}/inference", json=payload)
-            return response.json()
+            response = self.client.post("/inference", json=payload)
+            return orjson.loads(response.content)
         except Exception as e:
             return {"error": str(e)}
     
@@ -37,23 +49,63 @@ class MicroLLMClient:
                 "max_tokens": max_tokens,
                 "temperature": temperature
             }
-            response = requests.post(f"{self.base_url}/chat", json=payload)
-            return response.json()
+            response = self.client.post("/inference", json=payload)
+            return orjson.loads(response.content)
         except Exception as e:
             return {"error": str(e)}
     
+    def inference_many(self, prompts, max_tokens=512, temperature=0.7):
+        """Send several inference requests concurrently"""
+        return asyncio.run(self._post_many("/inference", prompts, max_tokens, temperature))
+    
+    def chat_many(self, messages, max_tokens=256, temperature=0.8):
+        """Send several chat-style messages concurrently"""
+        return asyncio.run(self._post_many("/inference", messages, max_tokens, temperature))
+    
+    async def _post_many(self, path, prompts, max_tokens, temperature):
+        """POST one request per prompt over a pooled async client.
+        
+        Returns a list of (result, elapsed_seconds) in prompt order.
+        """
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=120,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        ) as client:
+            async def post(prompt):
+                start_time = time.time()
+                try:
+                    payload = {
+                        "prompt": prompt,
+                        "max_tokens": max_tokens,
+                        "temperature": temperature
+                    }
+                    response = await client.post(path, json=payload)
+                    result = orjson.loads(response.content)
+                except Exception as e:
+                    result = {"error": str(e)}
+                return result, time.time() - start_time
+            
+            return await asyncio.gather(*(post(prompt) for prompt in prompts))
+    
     def list_models(self):
         """List available models"""
         try:
-            response = requests.get(f"{self.base_url}/models")
-            return response.json()
+            response = self.client.get("/models")
+            return orjson.loads(response.content)
         except Exception as e:
             return {"error": str(e)}
 
 def main():
     """Test the LLM service"""
     client = MicroLLMClient()
-    
+    try:
+        run_tests(client)
+    finally:
+        client.close()
+
+def run_tests(client):
+    """Run the test sequence against the service"""
     print("🔍 Testing Micro LLM Service...")
     print("=" * 50)
     
@@ -79,18 +131,17 @@ def main():
         "Write a short poem about programming."
     ]
     
-    for i, prompt in enumerate(test_prompts, 1):
+    # Send all prompts concurrently, then report them in order
+    results = client.inference_many(test_prompts, max_tokens=256)
+    
+    for i, (prompt, (result, elapsed)) in enumerate(zip(test_prompts, results), 1):
         print(f"\n3.{i} Prompt: {prompt}")
         print("-" * 30)
         
-        start_time = time.time()
-        result = client.inference(prompt, max_tokens=256)
-        end_time = time.time()
-        
         if "error" in result:
             print(f"❌ Error: {result['error']}")
         else:
-            print(f"✅ Response ({end_time - start_time:.2f}s):")
+            print(f"✅ Response ({elapsed:.2f}s):")
             print(result.get("response", "No response"))
     
     # Test chat
@@ -101,18 +152,16 @@ def main():
         "Thank you!"
     ]
     
-    for i, message in enumerate(chat_messages, 1):
+    results = client.chat_many(chat_messages, max_tokens=128)
+    
+    for i, (message, (result, elapsed)) in enumerate(zip(chat_messages, results), 1):
         print(f"\n4.{i} Chat: {message}")
         print("-" * 30)
         
-        start_time = time.time()
-        result = client.chat(message, max_tokens=128)
-        end_time = time.time()
-        
         if "error" in result:
             print(f"❌ Error: {result['error']}")
         else:
-            print(f"✅ Response ({end_time - start_time:.2f}s):")
+            print(f"✅ Response ({elapsed:.2f}s):")
             print(result.get("response", "No response"))
     
     print("\n" + "=" * 50)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The service lives in app/main.py and is run from inside app/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
@@ -0,0 +1,280 @@
+import asyncio
+
+import httpx
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+def ollama_handler(request: httpx.Request) -> httpx.Response:
+    """Minimal stand-in for the Ollama endpoints the service calls"""
+    ollama_handler.calls.append(request.url.path)
+    if request.url.path == "/api/version":
+        return httpx.Response(200, json={"version": "0.0.0"})
+    if request.url.path == "/api/tags":
+        return httpx.Response(200, json={"models": [{"name": main.MODEL_NAME}]})
+    if request.url.path == "/api/show":
+        return httpx.Response(200, json={"size": 1, "digest": "abc", "details": {"family": "gemma2"}})
+    if request.url.path == "/api/generate":
+        body = orjson.loads(request.content)
+        if body["prompt"] == "unreachable":
+            raise httpx.ConnectError("connection refused", request=request)
+        if body["stream"]:
+            chunks = [{"response": "echo", "done": False}, {"response": "", "done": True}]
+            return httpx.Response(200, content=b"".join(orjson.dumps(c) + b"\n" for c in chunks))
+        return httpx.Response(200, json={
+            "model": body["model"],
+            "created_at": "2025-01-01T00:00:00Z",
+            "response": f"echo: {body['prompt']}",
+            "done": True,
+            "eval_count": 3,
+            "total_duration": 100,
+            "eval_duration": 50,
+            "context": [1, 2, 3]
+        })
+    return httpx.Response(404)
+
+ollama_handler.calls = []
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    cache_dir = main.RESPONSE_CACHE_DIR
+    main.RESPONSE_CACHE_DIR = str(tmp_path_factory.mktemp("response-cache"))
+    mock = httpx.AsyncClient(
+        base_url=main.OLLAMA_BASE_URL,
+        transport=httpx.MockTransport(ollama_handler)
+    )
+    main.app.dependency_overrides[main.get_http] = lambda: mock
+    try:
+        with TestClient(main.app) as test_client:
+            test_client.startup_calls = list(ollama_handler.calls)
+            yield test_client
+    finally:
+        main.app.dependency_overrides.clear()
+        main.RESPONSE_CACHE_DIR = cache_dir
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    ollama_handler.calls.clear()
+    yield
+    ollama_handler.calls.clear()
+
+
+def test_startup_uses_overridden_client(client):
+    assert "/api/version" in client.startup_calls
+    assert main.app.state.http is main.app.dependency_overrides[main.get_http]()
+
+
+def test_health(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["available_models"] == [main.MODEL_NAME]
+
+
+def test_inference(client):
+    response = client.post("/inference", json={"prompt": "Hello", "temperature": 0.7})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["response"] == "echo: Hello"
+    assert data["model"] == main.MODEL_NAME
+    assert data["eval_count"] == 3
+    assert "context" not in data
+
+
+def test_inference_rejects_oversized_prompt(client):
+    response = client.post("/inference", json={"prompt": "x" * (main.MAX_PROMPT_CHARS + 1)})
+    assert response.status_code == 422
+
+
+def test_inference_stream_is_not_gzipped(client):
+    response = client.post(
+        "/inference",
+        json={"prompt": "Hello", "stream": True},
+        headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(main.STREAM_MEDIA_TYPE)
+    assert response.headers.get("content-encoding") != "gzip"
+    lines = [orjson.loads(line) for line in response.text.splitlines()]
+    assert lines[-1]["done"] is True
+
+
+def delayed_generate_client(calls=None):
+    """AsyncClient whose /api/generate takes num_predict milliseconds"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = orjson.loads(request.content)
+        if calls is not None:
+            calls.append(body["prompt"])
+        await asyncio.sleep(body["options"]["num_predict"] / 1000)
+        return httpx.Response(200, json={"response": body["prompt"], "done": True})
+    return httpx.AsyncClient(base_url=main.OLLAMA_BASE_URL, transport=httpx.MockTransport(handler))
+
+
+def generate_payload(prompt, max_tokens=5, temperature=0.0):
+    return main.build_generate_payload(
+        main.InferenceRequest(prompt=prompt, max_tokens=max_tokens, temperature=temperature)
+    )
+
+
+def test_batcher_resolves_each_request_independently():
+    async def scenario():
+        batcher = main.DynBatcher()
+        batcher.start()
+        mock = delayed_generate_client()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        
+        async def timed(payload):
+            response = await batcher.submit(mock, payload)
+            return response.json()["response"], loop.time() - start
+        
+        try:
+            return await asyncio.gather(
+                timed(generate_payload("fast", max_tokens=5)),
+                timed(generate_payload("slow", max_tokens=300))
+            )
+        finally:
+            await batcher.stop()
+            await mock.aclose()
+    
+    (fast, fast_elapsed), (slow, slow_elapsed) = asyncio.run(scenario())
+    assert (fast, slow) == ("fast", "slow")
+    assert fast_elapsed < 0.15
+    assert slow_elapsed >= 0.3
+
+
+def test_ttl_cache_survives_first_caller_cancellation():
+    calls = []
+    
+    @main.async_ttl_cache(10.0)
+    async def probe(key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return key
+    
+    async def scenario():
+        first = asyncio.create_task(probe("k"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(probe("k"))
+        await asyncio.sleep(0)
+        first.cancel()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        cached = await probe("k")
+        return results, cached
+    
+    (first, second), cached = asyncio.run(scenario())
+    assert isinstance(first, asyncio.CancelledError)
+    assert second == "k"
+    assert cached == "k"
+    assert calls == ["k"]
+
+
+def test_inference_maps_connect_error_to_503(client):
+    response = client.post("/inference", json={"prompt": "unreachable", "temperature": 0.7})
+    assert response.status_code == 503
+
+
+def test_inference_serves_deterministic_repeat_from_disk_cache(client):
+    request = {"prompt": "cache me", "temperature": 0.0}
+    first = client.post("/inference", json=request).json()
+    second = client.post("/inference", json=request).json()
+    assert first["total_duration"] == 100
+    assert second["response"] == first["response"]
+    assert second["total_duration"] == 0
+    assert second["eval_duration"] == 0
+    assert ollama_handler.calls.count("/api/generate") == 1
+
+
+def test_model_info_unknown_name_skips_upstream(client):
+    response = client.get("/model/does-not-exist")
+    assert response.status_code == 404
+    assert "/api/show" not in ollama_handler.calls
+
+
+def test_model_info_known_name(client):
+    response = client.get(f"/model/{main.MODEL_NAME}")
+    assert response.status_code == 200
+    assert response.json()["digest"] == "abc"
+    assert "/api/show" in ollama_handler.calls
+
+
+def test_ttl_cache_single_flight():
+    calls = []
+    
+    @main.async_ttl_cache(10.0)
+    async def probe(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+    
+    async def scenario():
+        return await asyncio.gather(*(probe("k") for _ in range(5)))
+    
+    assert asyncio.run(scenario()) == ["k"] * 5
+    assert calls == ["k"]
+
+
+def test_admission_controller_caps_concurrency():
+    async def scenario():
+        controller = main.AdmissionController(limit=2)
+        running = 0
+        peak = 0
+        
+        async def work():
+            nonlocal running, peak
+            async with controller:
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+        
+        await asyncio.gather(*(work() for _ in range(6)))
+        return peak, controller.active
+    
+    peak, active = asyncio.run(scenario())
+    assert peak == 2
+    assert active == 0
+
+
+def test_admission_controller_set_limit_wakes_waiters():
+    async def scenario():
+        controller = main.AdmissionController(limit=0)
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0.01)
+        blocked = not waiter.done()
+        await controller.set_limit(1)
+        await asyncio.wait_for(waiter, 1.0)
+        return blocked, controller.active
+    
+    blocked, active = asyncio.run(scenario())
+    assert blocked
+    assert active == 1
+
+
+def test_submit_deduplicated_shares_one_upstream_call(monkeypatch):
+    calls = []
+    
+    async def scenario():
+        batcher = main.DynBatcher()
+        monkeypatch.setattr(main, "batcher", batcher)
+        batcher.start()
+        mock = delayed_generate_client(calls)
+        payload = generate_payload("same prompt", max_tokens=20)
+        try:
+            responses = await asyncio.gather(
+                *(main.submit_deduplicated(mock, payload) for _ in range(3))
+            )
+        finally:
+            await batcher.stop()
+            await mock.aclose()
+        return [r.json()["response"] for r in responses]
+    
+    assert asyncio.run(scenario()) == ["same prompt"] * 3
+    assert calls == ["same prompt"]
+    assert main._inflight_generations == {}